@@ -5,25 +5,85 @@ Central configuration for the automated reel factory pipeline.
 """
 
 import os
+import pickle
 from pathlib import Path
-from dotenv import load_dotenv
-
-load_dotenv()
 
 # ─── Paths ────────────────────────────────────────────────────────────────────
-BASE_DIR = Path(__file__).parent.resolve()
+BASE_DIR = Path(os.path.dirname(os.path.abspath(__file__)))  # abspath skips resolve()'s realpath walk
 OUTPUT_DIR = BASE_DIR / "output"
-TEMP_DIR = BASE_DIR / "temp"
+TEMP_DIR = BASE_DIR / "temp"  # Per-run scratch, emptied by cleanup_temp_files()
+CACHE_DIR = BASE_DIR / "cache"  # Persistent across runs and cleanups
 LOGS_DIR = BASE_DIR / "logs"
 ASSETS_DIR = BASE_DIR / "assets"
 MUSIC_DIR = ASSETS_DIR / "music"
 
-# Create dirs on import
-for d in [OUTPUT_DIR, TEMP_DIR, LOGS_DIR, ASSETS_DIR, MUSIC_DIR]:
-    d.mkdir(parents=True, exist_ok=True)
+
+
+def _scan_subdirs(path: Path) -> set[str]:
+    """Names of the subdirectories of `path` (DirEntry.is_dir() is cached by scandir)."""
+    try:
+        with os.scandir(path) as it:
+            return {e.name for e in it if e.is_dir()}
+    except FileNotFoundError:
+        return set()
+
+
+def ensure_dirs() -> None:
+    """Create the working directories (called once at pipeline startup)."""
+    # One scandir per parent instead of a Path.mkdir per directory —
+    # on warm runs everything already exists and nothing is created.
+    existing = _scan_subdirs(BASE_DIR)
+    for d in (OUTPUT_DIR, TEMP_DIR, CACHE_DIR, LOGS_DIR, ASSETS_DIR):
+        if d.name not in existing:
+            os.makedirs(d, exist_ok=True)
+
+    # MUSIC_DIR is nested under ASSETS_DIR, which is guaranteed to exist now
+    if MUSIC_DIR.name not in _scan_subdirs(ASSETS_DIR):
+        os.mkdir(MUSIC_DIR)
+
+
+# ─── Environment (.env) ───────────────────────────────────────────────────────
+ENV_FILE = BASE_DIR / ".env"
+ENV_CACHE_FILE = BASE_DIR / ".env.cache.pkl"
+
+
+def _load_env() -> None:
+    """
+    Populate os.environ from .env, like load_dotenv().
+    The parsed values are pickled next to .env keyed by its mtime, so warm
+    starts skip re-parsing the file until it changes.
+    """
+    try:
+        env_mtime = ENV_FILE.stat().st_mtime
+    except OSError:
+        return  # No .env — rely on the real environment
+
+    values = None
+    try:
+        with open(ENV_CACHE_FILE, "rb") as f:
+            cached_mtime, cached_values = pickle.load(f)
+        if cached_mtime == env_mtime:
+            values = cached_values
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+
+    if values is None:
+        from dotenv import dotenv_values
+
+        values = {k: v for k, v in dotenv_values(ENV_FILE).items() if v is not None}
+        try:
+            with open(ENV_CACHE_FILE, "wb") as f:
+                pickle.dump((env_mtime, values), f)
+        except OSError:
+            pass  # Read-only checkout — just parse again next time
+
+    # Same semantics as load_dotenv(): real env vars win over .env
+    for key, value in values.items():
+        os.environ.setdefault(key, value)
+
 
 # ─── OpenRouter API (Free Models) ────────────────────────────────────────────
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
+# OPENROUTER_API_KEY — env-backed, see _ENV_DEFAULTS
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1/chat/completions"
 
 # Free models on OpenRouter (pick one)
@@ -31,21 +91,31 @@ OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1/chat/completions"
 #          "mistralai/mistral-7b-instruct:free",
 #          "google/gemma-2-9b-it:free",
 #          "qwen/qwen-2-7b-instruct:free"
-LLM_MODEL = os.getenv("LLM_MODEL", "openai/gpt-oss-120b:free")
+# LLM_MODEL — env-backed, see _ENV_DEFAULTS
+
+# Reuse the script for an identical (topic, style, mood, model) request
+# instead of calling the LLM again; set False to always regenerate
+ENABLE_SCRIPT_CACHE = True
+SCRIPT_CACHE_FILE = CACHE_DIR / "script_cache.json"
 
 # ─── Visual Generation ────────────────────────────────────────────────────────
 # Pollinations.ai — completely free, no API key needed
 POLLINATIONS_IMAGE_URL = "https://image.pollinations.ai/prompt/{prompt}"
+# Request images at the reel size (no local upscale); False restores the
+# 768×1344 render + LANCZOS/unsharp upscale path
+NATIVE_RESOLUTION = True
 POLLINATIONS_WIDTH = 1080
 POLLINATIONS_HEIGHT = 1920
 IMAGE_GENERATION_TIMEOUT = 120  # seconds
+# Finished scene frames keyed by prompt hash; oldest entries are evicted
+# once the cache grows past the limit
+IMAGE_CACHE_DIR = CACHE_DIR / "images"
+IMAGE_CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
 
 # ─── Voice Generation (edge-tts — free, no API key) ─────────────────────────
 # Voices: en-US-AriaNeural, en-US-GuyNeural, en-GB-SoniaNeural,
 #         en-IN-NeerjaNeural, en-AU-NatashaNeural
-TTS_VOICE = os.getenv("TTS_VOICE", "en-US-AriaNeural")
-TTS_RATE = os.getenv("TTS_RATE", "-10%")  # Slower = more cinematic
-TTS_PITCH = os.getenv("TTS_PITCH", "-5Hz")
+# TTS_VOICE / TTS_RATE / TTS_PITCH — env-backed, see _ENV_DEFAULTS
 
 # ─── Music ────────────────────────────────────────────────────────────────────
 # Duration of background music fade-in/out in seconds
@@ -60,8 +130,17 @@ REEL_FPS = 30
 SCENE_DURATION = 5.0  # Default seconds per scene (gives narration room to breathe)
 CROSSFADE_DURATION = 0.4
 EXPORT_CODEC = "libx264"
+# Software (x264) encode: mostly-still Ken Burns footage compresses well with
+# a fast preset + stillimage tuning; quality is held by CRF, not bitrate
+EXPORT_PRESET = "veryfast"
+EXPORT_TUNE = "stillimage"
+EXPORT_CRF = 20
+# GPU encoder tried first when the machine supports it (None to disable);
+# falls back to EXPORT_CODEC if a quick ffmpeg probe fails
+EXPORT_HW_CODEC = "h264_nvenc"
+EXPORT_HW_PRESET = "p4"
 EXPORT_AUDIO_CODEC = "aac"
-EXPORT_BITRATE = "8M"
+EXPORT_BITRATE = "8M"  # Used by the hardware encoder (x264 uses EXPORT_CRF)
 
 # ─── Text Overlays ───────────────────────────────────────────────────────────
 OVERLAY_FONT_SIZE = 56
@@ -72,5 +151,40 @@ OVERLAY_STROKE_WIDTH = 3
 OVERLAY_POSITION = ("center", 0.70)  # (x, y%) from top - moved higher to prevent cutoff
 
 # ─── Logging ──────────────────────────────────────────────────────────────────
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# LOG_LEVEL — env-backed, see _ENV_DEFAULTS
+# LOG_LEVEL_NUM — numeric logging level derived once from LOG_LEVEL
 LOG_FORMAT = "%(asctime)s | %(name)-20s | %(levelname)-7s | %(message)s"
+
+# ─── Env-backed settings (resolved lazily) ───────────────────────────────────
+# These are read from os.environ / .env on first attribute access and then
+# memoized as plain module globals, so code paths that never touch them
+# (e.g. --script skips LLM_MODEL) never pay for .env parsing.
+_ENV_DEFAULTS = {
+    "OPENROUTER_API_KEY": "",
+    "LLM_MODEL": "openai/gpt-oss-120b:free",
+    "TTS_VOICE": "en-US-AriaNeural",
+    "TTS_RATE": "-10%",   # Slower = more cinematic
+    "TTS_PITCH": "-5Hz",
+    "LOG_LEVEL": "INFO",
+}
+_env_loaded = False
+
+
+def __getattr__(name: str):
+    """Resolve env-backed settings on first access (PEP 562)."""
+    global _env_loaded
+    if name == "LOG_LEVEL_NUM":
+        import logging
+
+        level_name = str(globals().get("LOG_LEVEL") or __getattr__("LOG_LEVEL"))
+        value = getattr(logging, level_name.upper(), logging.INFO)
+        globals()[name] = value
+        return value
+    if name not in _ENV_DEFAULTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if not _env_loaded:
+        _load_env()
+        _env_loaded = True
+    value = os.environ.get(name, _ENV_DEFAULTS[name])
+    globals()[name] = value
+    return value
@@ -23,43 +23,195 @@ All modules are free / no-cost:
 """
 
 import argparse
+import atexit
+import functools
 import json
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
 import sys
 import time
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 # ─── Setup paths ──────────────────────────────────────────────────────────────
-sys.path.insert(0, str(Path(__file__).parent))
+# `python main.py` already puts this directory first on sys.path; only add it
+# when main is imported from somewhere else.
+_ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+if _ROOT_DIR not in sys.path:
+    sys.path.insert(0, _ROOT_DIR)
 
 import config
-from modules.script_generator import generate_script
-from modules.visual_generator import generate_scene_images
-from modules.voice_generator import generate_narration
-from modules.music_generator import generate_background_music
-from modules.assembly_engine import assemble_reel
-from modules.approval_gate import GenerationLog, request_approval, cleanup_temp_files
+
+try:
+    import orjson  # Optional: faster parsing of --script files
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads  # stdlib also accepts UTF-8 bytes
+
+# Pipeline modules are imported inside run_pipeline() — they pull in MoviePy,
+# numpy, requests and edge-tts, which would otherwise slow down --help and
+# argument errors.
+
+
+_logging_configured = False
+
+
+@functools.lru_cache(maxsize=None)
+def _pipeline_file_handler() -> logging.FileHandler:
+    """One timestamped log file per process, opened on first use and reused."""
+    log_path = config.LOGS_DIR / f"pipeline_{time.strftime('%Y%m%d_%H%M%S')}.log"
+    return logging.FileHandler(log_path, encoding="utf-8")
 
 
 def setup_logging():
-    """Configure logging for the pipeline."""
+    """Configure logging for the pipeline (no-op if already configured)."""
+    global _logging_configured
+    if _logging_configured:
+        return
+
+    config.ensure_dirs()
+
+    # Console output stays synchronous so log lines interleave correctly with
+    # the banners and prompts written via print()/input(). Only the log file
+    # is written by a background listener thread, so pipeline workers never
+    # block on disk I/O.
+    log_queue = queue.SimpleQueue()
     logging.basicConfig(
-        level=getattr(logging, config.LOG_LEVEL),
+        level=config.LOG_LEVEL_NUM,
         format=config.LOG_FORMAT,
         handlers=[
             logging.StreamHandler(sys.stdout),
-            logging.FileHandler(
-                config.LOGS_DIR / f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log",
-                encoding="utf-8"
-            ),
-        ]
+            logging.handlers.QueueHandler(log_queue),
+        ],
     )
+    listener = logging.handlers.QueueListener(log_queue, _pipeline_file_handler())
+    listener.start()
+    atexit.register(listener.stop)  # Flush remaining records on exit
+    _logging_configured = True
 
 
 logger = logging.getLogger("ReelFactory")
 
 
+# ─── Checkpoints ──────────────────────────────────────────────────────────────
+# After each successful step the script and asset paths (not the assets
+# themselves) are written to temp/<run_id>.ckpt.json. `--resume <run_id>`
+# feeds it back into run_pipeline(), which skips steps whose outputs are
+# still on disk — so a failed assembly doesn't regenerate everything.
+# Steps write their assets under temp/<run_id>/, so a later run can't
+# overwrite the files a checkpoint points at. Both are removed once the reel
+# is assembled with every step succeeding; a failed run keeps them for --resume.
+
+def _checkpoint_path(run_id: str) -> Path:
+    return config.TEMP_DIR / f"{run_id}.ckpt.json"
+
+
+def _run_dir(run_id: str) -> Path:
+    """Per-run scratch directory for generated images, narration and music."""
+    return config.TEMP_DIR / run_id
+
+
+def _discard_run_files(run_id: str):
+    """Delete a finished run's scratch directory and checkpoint."""
+    shutil.rmtree(_run_dir(run_id), ignore_errors=True)
+    _checkpoint_path(run_id).unlink(missing_ok=True)
+
+
+def _save_checkpoint(run_id: str, **state):
+    """Merge `state` into the run's checkpoint file."""
+    path = _checkpoint_path(run_id)
+    checkpoint = load_checkpoint(run_id) if path.exists() else {"run_id": run_id}
+    for key, value in state.items():
+        if isinstance(value, list):
+            value = [str(p) if p else None for p in value]
+        elif isinstance(value, Path):
+            value = str(value)
+        checkpoint[key] = value
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(checkpoint, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def load_checkpoint(run_id: str) -> dict:
+    """Read a run's checkpoint (raises FileNotFoundError if there is none)."""
+    return _json_loads(_checkpoint_path(run_id).read_bytes())
+
+
+def _restore_paths(paths: Optional[list]) -> Optional[list]:
+    """Checkpointed path list → Paths, or None if any listed file is gone."""
+    if not paths:
+        return None
+    restored = [Path(p) if p else None for p in paths]
+    if not any(restored) or not all(p.exists() for p in restored if p):
+        return None
+    return restored
+
+
+def _restore_step(gen_log, step_name: str, details: dict):
+    """Record a step that was satisfied from the checkpoint."""
+    gen_log.start_step(step_name)
+    gen_log.complete_step(step_name, {**details, "source": "checkpoint"})
+    logger.info(f"⏩ Resumed {step_name} from checkpoint")
+
+
+def _run_visual_step(script: dict, gen_log, output_dir: Path, refresh: bool = False) -> list:
+    """STEP 2: Visual generation. Returns [] on failure."""
+    gen_log.start_step("visual_generation")
+    try:
+        from modules.visual_generator import generate_scene_images
+
+        image_paths = generate_scene_images(script, output_dir, refresh=refresh)
+        gen_log.set_assets(images=image_paths)
+        gen_log.complete_step("visual_generation", {
+            "images_generated": len(image_paths),
+        })
+        return image_paths
+    except Exception as e:
+        gen_log.fail_step("visual_generation", str(e))
+        logger.warning(f"Visual generation had issues: {e}")
+        return []
+
+
+def _run_voice_step(script: dict, gen_log, output_dir: Path) -> list:
+    """STEP 3: Voice generation. Returns [] on failure."""
+    gen_log.start_step("voice_generation")
+    try:
+        from modules.voice_generator import generate_narration
+
+        narration_paths = generate_narration(script, output_dir)
+        gen_log.set_assets(narrations=narration_paths)
+        gen_log.complete_step("voice_generation", {
+            "narrations_generated": sum(1 for p in narration_paths if p),
+            "voice": config.TTS_VOICE,
+        })
+        return narration_paths
+    except Exception as e:
+        gen_log.fail_step("voice_generation", str(e))
+        logger.warning(f"Voice generation had issues: {e}")
+        return []
+
+
+def _run_music_step(script: dict, gen_log, output_dir: Path) -> Optional[Path]:
+    """STEP 4: Music generation. Returns None on failure."""
+    gen_log.start_step("music_generation")
+    try:
+        from modules.music_generator import generate_background_music
+
+        music_path = generate_background_music(script, output_dir)
+        gen_log.set_assets(music=music_path)
+        gen_log.complete_step("music_generation", {
+            "music_file": str(music_path),
+        })
+        return music_path
+    except Exception as e:
+        gen_log.fail_step("music_generation", str(e))
+        logger.warning(f"Music generation had issues: {e}")
+        return None
+
+
 def run_pipeline(
     topic: str = "",
     style: str = "cinematic",
@@ -67,6 +219,8 @@ def run_pipeline(
     auto_approve: bool = False,
     output_filename: str = None,
     custom_script: dict = None,
+    checkpoint: dict = None,
+    refresh: bool = False,
 ) -> Path:
     """
     Execute the full reel generation pipeline.
@@ -78,58 +232,88 @@ def run_pipeline(
         auto_approve: Skip manual approval gate
         output_filename: Custom output filename (without extension)
         custom_script: Pre-written script dict (skips LLM generation)
+        checkpoint: Saved state from load_checkpoint(); steps whose outputs
+            are still on disk are skipped and the run ID is reused
+        refresh: Bypass the script and scene-image caches and generate a
+            new take
 
     Returns:
         Path to the final MP4 file
     """
-    gen_log = GenerationLog()
+    from modules.approval_gate import GenerationLog, request_approval
+
+    checkpoint = checkpoint or {}
+    gen_log = GenerationLog(run_id=checkpoint.get("run_id"))
     pipeline_start = time.time()
 
-    mode = "CUSTOM SCRIPT" if custom_script else "AI GENERATED"
+    if checkpoint:
+        mode = "RESUMED"
+        custom_script = custom_script or checkpoint.get("script")
+        output_filename = output_filename or checkpoint.get("output_filename")
+    else:
+        mode = "CUSTOM SCRIPT" if custom_script else "AI GENERATED"
 
-    print("\n" + "▓" * 60)
-    print("▓  🎬  REELGENERATOR — AUTOMATED REEL FACTORY")
-    print("▓" * 60)
-    print(f"▓  Mode:   {mode}")
     if custom_script:
-        print(f"▓  Title:  {custom_script.get('title', 'Custom')}")
+        details = f"▓  Title:  {custom_script.get('title', 'Custom')}"
     else:
-        print(f"▓  Topic:  {topic}")
-        print(f"▓  Style:  {style}")
-        print(f"▓  Mood:   {mood}")
-    print(f"▓  Run ID: {gen_log.run_id}")
-    print("▓" * 60 + "\n")
+        details = (
+            f"▓  Topic:  {topic}\n"
+            f"▓  Style:  {style}\n"
+            f"▓  Mood:   {mood}"
+        )
+    print(
+        f"\n{'▓' * 60}\n"
+        f"▓  🎬  REELGENERATOR — AUTOMATED REEL FACTORY\n"
+        f"{'▓' * 60}\n"
+        f"▓  Mode:   {mode}\n"
+        f"{details}\n"
+        f"▓  Run ID: {gen_log.run_id}\n"
+        f"{'▓' * 60}\n"
+    )
 
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     # STEP 1: SCRIPT (Load custom or generate via AI)
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    if not checkpoint.get("narration_paths"):
+        # Warm the TTS connection path while the script step runs
+        from modules.voice_generator import prewarm
+        prewarm()
+
     gen_log.start_step("script_generation")
     try:
         if custom_script:
             script = custom_script
-            logger.info(f"Using custom script: '{script.get('title', 'Untitled')}'")
-            gen_log.complete_step("script_generation", {
-                "title": script.get("title"),
-                "scenes": len(script.get("scenes", [])),
-                "source": "custom_json",
-            })
+            source_details = {"source": "checkpoint" if checkpoint else "custom_json"}
         else:
-            script = generate_script(topic=topic, style=style, mood=mood)
-            gen_log.complete_step("script_generation", {
-                "title": script.get("title"),
-                "scenes": len(script.get("scenes", [])),
-                "model": config.LLM_MODEL,
-                "source": "openrouter_llm",
-            })
+            from modules.script_generator import generate_script
+
+            script = generate_script(topic=topic, style=style, mood=mood, refresh=refresh)
+            source_details = {"model": config.LLM_MODEL, "source": "openrouter_llm"}
 
+        # Read the script's fields once for logging and the summary below
+        # (both sources went through validate_script, so the keys exist)
+        title = script["title"]
+        scenes = script["scenes"]
+        emotion = script["emotional_core"]
+        audio_tone = script["audio_tone"]
+
+        if custom_script:
+            logger.info(f"Using custom script: '{title}'")
+        gen_log.complete_step("script_generation", {
+            "title": title,
+            "scenes": len(scenes),
+            **source_details,
+        })
         gen_log.set_script(script)
+        _save_checkpoint(gen_log.run_id, script=script, output_filename=output_filename)
 
-        print(f"\n📄 Script: \"{script['title']}\"")
-        print(f"   Emotion: {script.get('emotional_core', 'N/A')}")
-        print(f"   Music tone: {script.get('audio_tone', 'N/A')}")
-        for s in script["scenes"]:
-            print(f"   Scene {s['scene_number']}: \"{s['text_overlay']}\" ({s['duration']}s)")
-        print()
+        print(f"\n📄 Script: \"{title}\"")
+        print(f"   Emotion: {emotion}")
+        print(f"   Music tone: {audio_tone}")
+        print("\n".join(
+            f"   Scene {s['scene_number']}: \"{s['text_overlay']}\" ({s['duration']}s)"
+            for s in scenes
+        ) + "\n")
 
     except Exception as e:
         gen_log.fail_step("script_generation", str(e))
@@ -138,62 +322,65 @@ def run_pipeline(
         raise
 
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-    # STEP 2: VISUAL GENERATION
-    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-    gen_log.start_step("visual_generation")
-    try:
-        image_paths = generate_scene_images(script)
-        gen_log.set_assets(images=image_paths)
-        gen_log.complete_step("visual_generation", {
-            "images_generated": len(image_paths),
-        })
-    except Exception as e:
-        gen_log.fail_step("visual_generation", str(e))
-        logger.warning(f"Visual generation had issues: {e}")
-        image_paths = []
-
-    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-    # STEP 3: VOICE GENERATION
-    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-    gen_log.start_step("voice_generation")
-    try:
-        narration_paths = generate_narration(script)
-        gen_log.set_assets(narrations=narration_paths)
-        gen_log.complete_step("voice_generation", {
-            "narrations_generated": sum(1 for p in narration_paths if p),
-            "voice": config.TTS_VOICE,
-        })
-    except Exception as e:
-        gen_log.fail_step("voice_generation", str(e))
-        logger.warning(f"Voice generation had issues: {e}")
-        narration_paths = []
-
-    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-    # STEP 4: MUSIC GENERATION
+    # STEPS 2–4: VISUALS, VOICE, MUSIC (concurrently)
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-    gen_log.start_step("music_generation")
-    try:
-        music_path = generate_background_music(script)
-        gen_log.set_assets(music=music_path)
-        gen_log.complete_step("music_generation", {
-            "music_file": str(music_path),
-        })
-    except Exception as e:
-        gen_log.fail_step("music_generation", str(e))
-        logger.warning(f"Music generation had issues: {e}")
-        music_path = None
+    # All three only consume the script, so their network / synthesis time
+    # overlaps instead of adding up. Outputs restored from a checkpoint are
+    # reused as-is.
+    image_paths = _restore_paths(checkpoint.get("image_paths"))
+    narration_paths = _restore_paths(checkpoint.get("narration_paths"))
+    music_path = _restore_paths([checkpoint.get("music_path")])
+    music_path = music_path[0] if music_path else None
+    run_dir = _run_dir(gen_log.run_id)
+
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="step") as pool:
+        if image_paths is None:
+            visual_future = pool.submit(_run_visual_step, script, gen_log, run_dir, refresh)
+        else:
+            gen_log.set_assets(images=image_paths)
+            _restore_step(gen_log, "visual_generation", {"images_generated": len(image_paths)})
+        if narration_paths is None:
+            voice_future = pool.submit(_run_voice_step, script, gen_log, run_dir)
+        else:
+            gen_log.set_assets(narrations=narration_paths)
+            _restore_step(gen_log, "voice_generation", {
+                "narrations_generated": sum(1 for p in narration_paths if p),
+            })
+        if music_path is None:
+            music_future = pool.submit(_run_music_step, script, gen_log, run_dir)
+        else:
+            gen_log.set_assets(music=music_path)
+            _restore_step(gen_log, "music_generation", {"music_file": str(music_path)})
+
+    if image_paths is None:
+        image_paths = visual_future.result()
+    if narration_paths is None:
+        narration_paths = voice_future.result()
+    if music_path is None:
+        music_path = music_future.result()
+
+    # Failed steps return empty fallbacks — only checkpoint real outputs
+    _save_checkpoint(gen_log.run_id, **{
+        key: value for key, value in (
+            ("image_paths", image_paths),
+            ("narration_paths", narration_paths),
+            ("music_path", music_path),
+        ) if value
+    })
 
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     # STEP 5: ASSEMBLY
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     gen_log.start_step("assembly")
     try:
+        from modules.assembly_engine import assemble_reel
+
         if output_filename:
             output_path = config.OUTPUT_DIR / f"{output_filename}.mp4"
         else:
             output_path = None  # Let assembly engine generate name from title
 
-        final_video = assemble_reel(
+        final_video, size_bytes = assemble_reel(
             script=script,
             image_paths=image_paths,
             narration_paths=narration_paths,
@@ -203,14 +390,20 @@ def run_pipeline(
         gen_log.set_assets(output_video=final_video)
         gen_log.complete_step("assembly", {
             "output_file": str(final_video),
-            "file_size_mb": round(final_video.stat().st_size / (1024 * 1024), 2),
+            "file_size_mb": round(size_bytes / (1024 * 1024), 2),
         })
     except Exception as e:
         gen_log.fail_step("assembly", str(e))
         gen_log.finalize("failed")
         logger.error(f"Pipeline failed at assembly: {e}")
+        logger.error(f"Retry without regenerating assets: python main.py --resume {gen_log.run_id}")
         raise
 
+    # The reel is in output/ now; keep the intermediates only if a step
+    # failed and a --resume could still produce a better take
+    if not gen_log.log_data["errors"]:
+        _discard_run_files(gen_log.run_id)
+
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     # STEP 6: APPROVAL GATE
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -225,16 +418,18 @@ def run_pipeline(
     )
 
     if approved:
-        print(f"\n🎬 Your reel is ready: {final_video}")
-        print(f"⏱️  Total pipeline time: {total_time:.1f}s\n")
+        print(
+            f"\n🎬 Your reel is ready: {final_video}\n"
+            f"⏱️  Total pipeline time: {total_time:.1f}s\n"
+        )
     else:
         print(f"\n🔄 Reel rejected. Adjust topic/mood and try again.\n")
 
     return final_video
 
 
-def main():
-    """CLI entry point."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
     parser = argparse.ArgumentParser(
         description="🎬 ReelGenerator — Automated Reel Factory",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -247,6 +442,9 @@ Examples (AI-generated script):
 Examples (Custom script from JSON):
   python main.py --script scripts/glimpzo_frustration.json --auto-approve
   python main.py --script scripts/glimpzo_early_creators.json -o glimpzo_reel
+
+Resume a failed run (reuses its script and generated assets):
+  python main.py --resume 20250101_120000_a1b2c3
         """
     )
 
@@ -263,6 +461,13 @@ Examples (Custom script from JSON):
         default=None,
         help="Path to a custom script JSON file (skips AI script generation)"
     )
+    parser.add_argument(
+        "--resume", "-r",
+        type=str,
+        default=None,
+        metavar="RUN_ID",
+        help="Resume a previous run from its checkpoint (skips completed steps)"
+    )
     parser.add_argument(
         "--style", "-s",
         type=str,
@@ -282,18 +487,32 @@ Examples (Custom script from JSON):
         action="store_true",
         help="Skip manual approval gate"
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Generate a new script and images instead of reusing cached ones"
+    )
     parser.add_argument(
         "--output", "-o",
         type=str,
         default=None,
         help="Custom output filename (without .mp4 extension)"
     )
+    return parser
 
+
+# Pure configuration — built once and reused by every main() call
+_PARSER = _build_parser()
+
+
+def main():
+    """CLI entry point."""
+    parser = _PARSER
     args = parser.parse_args()
 
-    # Validate: must provide either topic or --script
-    if not args.topic and not args.script:
-        parser.error("Provide a topic OR use --script <file.json>")
+    # Validate: must provide a topic, --script or --resume
+    if not args.topic and not args.script and not args.resume:
+        parser.error("Provide a topic OR use --script <file.json> OR --resume <run_id>")
 
     setup_logging()
 
@@ -304,10 +523,28 @@ Examples (Custom script from JSON):
         if not script_path.exists():
             logger.error(f"Script file not found: {script_path}")
             sys.exit(1)
-        with open(script_path, "r", encoding="utf-8") as f:
-            custom_script = json.load(f)
+        # Validate once up front instead of failing mid-pipeline
+        from modules.script_generator import validate_script
+
+        try:
+            # JSON syntax errors (json / orjson) are ValueErrors too
+            custom_script = _json_loads(script_path.read_bytes())
+            validate_script(custom_script)
+        except ValueError as e:
+            logger.error(f"Invalid script file {script_path}: {e}")
+            sys.exit(1)
         logger.info(f"Loaded custom script: {script_path}")
 
+    # Load checkpoint if resuming
+    checkpoint = None
+    if args.resume:
+        try:
+            checkpoint = load_checkpoint(args.resume)
+        except FileNotFoundError:
+            logger.error(f"No checkpoint found for run: {args.resume}")
+            sys.exit(1)
+        logger.info(f"Resuming run {args.resume}")
+
     try:
         result = run_pipeline(
             topic=args.topic,
@@ -316,6 +553,8 @@ Examples (Custom script from JSON):
             auto_approve=args.auto_approve,
             output_filename=args.output,
             custom_script=custom_script,
+            checkpoint=checkpoint,
+            refresh=args.refresh,
         )
         sys.exit(0)
 
@@ -0,0 +1,62 @@
+"""
+Shared HTTP session for the network-bound modules.
+
+A single pooled `requests.Session` keeps TCP/TLS connections alive between
+calls (LLM request, per-scene image fetches) instead of re-handshaking for
+each one. Transient gateway errors on idempotent requests are retried with
+backoff; POSTs are never retried, so an LLM call is not billed twice.
+
+`requests` (and urllib3/certifi behind it) is the most expensive import in
+the visual path, so the session is built on first use rather than at import.
+"""
+
+import functools
+import logging
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger("HTTP")
+
+POOL_SIZE = 8  # ≥ concurrent scene fetches
+WARM_TIMEOUT = 5  # seconds
+
+
+@functools.lru_cache(maxsize=1)
+def get_session() -> "requests.Session":
+    """The process-wide pooled session (created on first call)."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def warm_connection(url: str) -> None:
+    """
+    Open (DNS + TCP + TLS) a pooled connection to `url`'s host ahead of time
+    with a cheap HEAD request, so the first real request reuses it.
+    Best effort: failures are only logged.
+    """
+    import requests
+
+    parts = urlsplit(url)
+    try:
+        get_session().head(f"{parts.scheme}://{parts.netloc}/", timeout=WARM_TIMEOUT)
+    except requests.RequestException as e:
+        logger.debug(f"Connection warm-up to {parts.netloc} failed: {e}")
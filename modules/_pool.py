@@ -0,0 +1,15 @@
+"""
+Process-wide worker pool for short, independent leaf tasks
+(scene image fetches, scene clip construction, ...).
+
+Threads are spawned lazily on first submit and reused across steps and
+runs instead of each call site building and tearing down its own executor.
+
+Only submit work that does not itself wait on POOL — a task blocking on
+another POOL task can starve the pool. Pipeline-level orchestration in
+main.py keeps its own executor for that reason.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="reel")
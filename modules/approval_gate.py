@@ -12,9 +12,11 @@ Features:
 
 import json
 import logging
+import secrets
 import shutil
+import threading
 import time
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -22,13 +24,46 @@ import config
 
 logger = logging.getLogger("ApprovalGate")
 
+try:
+    import orjson  # Optional: faster log serialization
+
+    def _dumps_pretty(obj) -> bytes:
+        """Serialize to 2-space indented UTF-8 JSON."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    def _dumps_line(obj) -> bytes:
+        """Serialize to compact single-line UTF-8 JSON."""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _dumps_pretty(obj) -> bytes:
+        """Serialize to 2-space indented UTF-8 JSON."""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+    def _dumps_line(obj) -> bytes:
+        """Serialize to compact single-line UTF-8 JSON."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 
 class GenerationLog:
-    """Tracks and persists a full reel generation run."""
+    """
+    Tracks and persists a full reel generation run.
+
+    Step events update the in-memory log and are appended, one JSON line
+    each, to a buffered run_<id>.events.jsonl sidecar. The full run_<id>.json
+    summary is written once, on a background thread, when the run is
+    finalized.
+    """
 
     def __init__(self, run_id: Optional[str] = None):
-        self.run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        self.started_at = datetime.now(timezone.utc).isoformat()
+        # Wall-clock anchor + monotonic offsets: later timestamps skip the
+        # clock/tz lookup and are immune to system clock jumps mid-run
+        self._t0_wall = datetime.now(timezone.utc)
+        self._t0_mono = time.monotonic()
+        # Random suffix: runs started in the same second get distinct IDs
+        self.run_id = run_id or (
+            f"{self._t0_wall.strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(3)}"
+        )
+        self.started_at = self._t0_wall.isoformat()
         self.log_data = {
             "run_id": self.run_id,
             "started_at": self.started_at,
@@ -51,42 +86,57 @@ class GenerationLog:
             "errors": [],
         }
         self._step_timers = {}
+        self._save_thread: Optional[threading.Thread] = None
+        self._events_file = None  # Opened on first event
+        self._events_lock = threading.Lock()  # Steps 2–4 log from worker threads
 
     def start_step(self, step_name: str):
         """Mark a pipeline step as started."""
-        self._step_timers[step_name] = time.time()
+        self._step_timers[step_name] = time.monotonic()
+        now = self._now_iso()
         self.log_data["pipeline_steps"][step_name] = {
             "status": "running",
-            "started_at": datetime.now(timezone.utc).isoformat(),
+            "started_at": now,
         }
+        self._log_event("step_started", step=step_name, at=now)
         logger.info(f"▶ Step started: {step_name}")
 
     def complete_step(self, step_name: str, details: Optional[dict] = None):
         """Mark a pipeline step as completed."""
-        elapsed = time.time() - self._step_timers.get(step_name, time.time())
+        elapsed = self._elapsed(step_name)
+        now = self._now_iso()
         self.log_data["pipeline_steps"][step_name].update({
             "status": "completed",
-            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "completed_at": now,
             "duration_seconds": round(elapsed, 2),
             "details": details or {},
         })
         self.log_data["timings"][step_name] = round(elapsed, 2)
+        self._log_event(
+            "step_completed", step=step_name, at=now,
+            duration_seconds=round(elapsed, 2), details=details or {},
+        )
         logger.info(f"✅ Step completed: {step_name} ({elapsed:.1f}s)")
 
     def fail_step(self, step_name: str, error: str):
         """Mark a pipeline step as failed."""
-        elapsed = time.time() - self._step_timers.get(step_name, time.time())
+        elapsed = self._elapsed(step_name)
+        now = self._now_iso()
         self.log_data["pipeline_steps"][step_name].update({
             "status": "failed",
-            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "completed_at": now,
             "duration_seconds": round(elapsed, 2),
             "error": error,
         })
         self.log_data["errors"].append({
             "step": step_name,
             "error": error,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": now,
         })
+        self._log_event(
+            "step_failed", step=step_name, at=now,
+            duration_seconds=round(elapsed, 2), error=error,
+        )
         logger.error(f"❌ Step failed: {step_name} — {error}")
 
     def set_script(self, script: dict):
@@ -112,23 +162,60 @@ class GenerationLog:
 
     def finalize(self, status: str = "completed"):
         """Finalize the log and save to disk."""
-        self.log_data["completed_at"] = datetime.now(timezone.utc).isoformat()
+        now = self._now_iso()
+        self.log_data["completed_at"] = now
         self.log_data["status"] = status
-
-        # Calculate total duration
-        if self.log_data["timings"]:
-            self.log_data["total_duration_seconds"] = round(
-                sum(self.log_data["timings"].values()), 2
-            )
-
-        self._save()
+        self._log_event("finalized", at=now, status=status)
+        self._close_events()
+
+        # Wall-clock total — steps 2–4 overlap, so summing timings overstates it
+        self.log_data["total_duration_seconds"] = round(
+            time.monotonic() - self._t0_mono, 2
+        )
+
+        # Non-daemon thread: the interpreter waits for the write at exit
+        self._save_thread = threading.Thread(
+            target=self._save, name=f"GenerationLog-{self.run_id}"
+        )
+        self._save_thread.start()
+
+    def _now_iso(self) -> str:
+        """Current UTC time as ISO-8601, derived from the monotonic clock."""
+        elapsed = time.monotonic() - self._t0_mono
+        return (self._t0_wall + timedelta(seconds=elapsed)).isoformat()
+
+    def _elapsed(self, step_name: str) -> float:
+        """Seconds since `step_name` started (0 if it never did)."""
+        started = self._step_timers.get(step_name)
+        return time.monotonic() - started if started is not None else 0.0
+
+    def _log_event(self, event: str, **fields):
+        """Append one event line to the run's JSONL sidecar (buffered)."""
+        line = _dumps_line({"event": event, **fields}) + b"\n"
+        with self._events_lock:
+            if self._events_file is None:
+                config.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+                events_path = config.LOGS_DIR / f"run_{self.run_id}.events.jsonl"
+                self._events_file = open(events_path, "ab", buffering=64 * 1024)
+            self._events_file.write(line)
+
+    def _close_events(self):
+        """Flush and close the JSONL sidecar."""
+        with self._events_lock:
+            if self._events_file is not None:
+                self._events_file.close()
+                self._events_file = None
+
+    def wait_saved(self, timeout: Optional[float] = None):
+        """Block until the log written by finalize() is on disk."""
+        if self._save_thread is not None:
+            self._save_thread.join(timeout)
 
     def _save(self):
         """Persist log to JSON file."""
         config.LOGS_DIR.mkdir(parents=True, exist_ok=True)
         log_path = config.LOGS_DIR / f"run_{self.run_id}.json"
-        with open(log_path, "w", encoding="utf-8") as f:
-            json.dump(self.log_data, f, indent=2, ensure_ascii=False)
+        log_path.write_bytes(_dumps_pretty(self.log_data))
         logger.info(f"📋 Generation log saved: {log_path}")
         return log_path
 
@@ -164,7 +251,10 @@ def request_approval(
     print(f"⏱️  Duration: {total_duration:.1f}s")
     print(f"\n📁 Output:   {output_video}")
 
-    file_size = output_video.stat().st_size / (1024 * 1024) if output_video.exists() else 0
+    try:
+        file_size = output_video.stat().st_size / (1024 * 1024)
+    except FileNotFoundError:
+        file_size = 0
     print(f"📦 Size:     {file_size:.1f} MB")
 
     print("\n📝 Scenes:")
@@ -190,52 +280,72 @@ def request_approval(
         logger.info("Auto-approve mode: approved")
         gen_log.log_data["approval"] = {
             "approved": True,
-            "reviewed_at": datetime.now(timezone.utc).isoformat(),
+            "reviewed_at": gen_log._now_iso(),
             "reviewer_notes": "Auto-approved",
         }
         gen_log.finalize("approved")
         print("✅ Auto-approved\n")
         return True
 
-    # Interactive approval
+    # Interactive approval: each action returns True/False to finish, None to re-prompt
     while True:
         choice = input("\n🔍 Action: [A]pprove  [R]eject  [V]iew script details → ").strip().upper()
+        result = _APPROVAL_ACTIONS.get(choice, _invalid_choice)(gen_log, script)
+        if result is not None:
+            return result
 
-        if choice == "A":
-            notes = input("   Notes (optional): ").strip() or "Approved by reviewer"
-            gen_log.log_data["approval"] = {
-                "approved": True,
-                "reviewed_at": datetime.now(timezone.utc).isoformat(),
-                "reviewer_notes": notes,
-            }
-            gen_log.finalize("approved")
-            print("\n✅ REEL APPROVED — Ready for publishing!")
-            return True
-
-        elif choice == "R":
-            reason = input("   Rejection reason: ").strip() or "Rejected by reviewer"
-            gen_log.log_data["approval"] = {
-                "approved": False,
-                "reviewed_at": datetime.now(timezone.utc).isoformat(),
-                "reviewer_notes": reason,
-            }
-            gen_log.finalize("rejected")
-            print("\n❌ REEL REJECTED")
-            return False
-
-        elif choice == "V":
-            print("\n" + json.dumps(script, indent=2))
 
-        else:
-            print("   Invalid choice. Enter A, R, or V.")
+def _approve(gen_log: GenerationLog, script: dict) -> Optional[bool]:
+    notes = input("   Notes (optional): ").strip() or "Approved by reviewer"
+    gen_log.log_data["approval"] = {
+        "approved": True,
+        "reviewed_at": gen_log._now_iso(),
+        "reviewer_notes": notes,
+    }
+    gen_log.finalize("approved")
+    print("\n✅ REEL APPROVED — Ready for publishing!")
+    return True
+
+
+def _reject(gen_log: GenerationLog, script: dict) -> Optional[bool]:
+    reason = input("   Rejection reason: ").strip() or "Rejected by reviewer"
+    gen_log.log_data["approval"] = {
+        "approved": False,
+        "reviewed_at": gen_log._now_iso(),
+        "reviewer_notes": reason,
+    }
+    gen_log.finalize("rejected")
+    print("\n❌ REEL REJECTED")
+    return False
+
+
+def _view(gen_log: GenerationLog, script: dict) -> Optional[bool]:
+    print("\n" + _dumps_pretty(script).decode("utf-8"))
+    return None
+
+
+def _invalid_choice(gen_log: GenerationLog, script: dict) -> Optional[bool]:
+    print("   Invalid choice. Enter A, R, or V.")
+    return None
+
+
+_APPROVAL_ACTIONS = {"A": _approve, "R": _reject, "V": _view}
 
 
 def cleanup_temp_files():
     """Remove temporary files after approval/rejection."""
-    if config.TEMP_DIR.exists():
-        shutil.rmtree(config.TEMP_DIR)
-        config.TEMP_DIR.mkdir(parents=True, exist_ok=True)
-        logger.info("🗑️  Temp files cleaned up")
+    # Empty the directory in place rather than rmtree + mkdir, which would
+    # drop and recreate the directory inode on every cleanup
+    try:
+        entries = list(config.TEMP_DIR.iterdir())
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.is_dir() and not entry.is_symlink():
+            shutil.rmtree(entry)
+        else:
+            entry.unlink(missing_ok=True)
+    logger.info("🗑️  Temp files cleaned up")
 
 
 # ─── Standalone test ──────────────────────────────────────────────────────────
@@ -247,4 +357,5 @@ if __name__ == "__main__":
     time.sleep(0.1)
     log.complete_step("test_step", {"detail": "test"})
     log.finalize("test_completed")
+    log.wait_saved()
     print(f"Log saved: {config.LOGS_DIR}")
@@ -14,25 +14,36 @@ Uses MoviePy for composition:
 Requires FFmpeg installed on system.
 """
 
+import functools
 import logging
+import subprocess
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+from PIL import Image as PILImage
 from moviepy import (
     ImageClip,
     TextClip,
     CompositeVideoClip,
-    CompositeAudioClip,
+    AudioArrayClip,
     AudioFileClip,
     concatenate_videoclips,
-    concatenate_audioclips,
     vfx,
 )
 
 import config
+from modules._pool import POOL
+
+try:
+    import cv2  # Optional: SIMD resize for the per-frame Ken Burns zoom
+except ImportError:
+    cv2 = None
 
 logger = logging.getLogger("AssemblyEngine")
 
+AUDIO_MIX_FPS = 44100  # Sample rate of the in-memory audio mix
+
 
 def assemble_reel(
     script: dict,
@@ -40,7 +51,7 @@ def assemble_reel(
     narration_paths: list[Optional[Path]],
     music_path: Optional[Path],
     output_path: Optional[Path] = None,
-) -> Path:
+) -> tuple[Path, int]:
     """
     Assemble all assets into a final MP4 reel.
 
@@ -52,7 +63,7 @@ def assemble_reel(
         output_path: Final MP4 output path
 
     Returns:
-        Path to the exported MP4 file
+        (path to the exported MP4 file, its size in bytes)
     """
     if output_path is None:
         title_slug = script.get("title", "reel").lower().replace(" ", "_")[:30]
@@ -64,40 +75,22 @@ def assemble_reel(
     output_path.parent.mkdir(parents=True, exist_ok=True)
     scenes = script["scenes"]
     crossfade = config.CROSSFADE_DURATION
+    reel_size = (config.REEL_WIDTH, config.REEL_HEIGHT)
+    fps = config.REEL_FPS
 
     logger.info(f"Assembling reel: {len(scenes)} scenes → {output_path}")
 
     # ─── Build scene video clips (NO audio attached) ──────────────────────
-    scene_clips = []
-    scene_durations = []
-
-    for i, scene in enumerate(scenes):
-        scene_num = scene["scene_number"]
-        duration = scene.get("duration", config.SCENE_DURATION)
-        text_overlay = scene.get("text_overlay", "")
-
-        logger.info(f"Building Scene {scene_num} clip ({duration}s)")
-
-        # 1. Base image clip with Ken Burns effect (slow zoom)
-        if i < len(image_paths) and image_paths[i] and image_paths[i].exists():
-            img_clip = _create_scene_clip(image_paths[i], duration)
-        else:
-            logger.warning(f"Scene {scene_num}: No image found, using black frame")
-            img_clip = ImageClip(
-                _create_black_frame(), duration=duration
-            ).with_fps(config.REEL_FPS)
-
-        # 2. Text overlay
-        if text_overlay:
-            txt_clip = _create_text_overlay(text_overlay, duration)
-            img_clip = CompositeVideoClip(
-                [img_clip, txt_clip],
-                size=(config.REEL_WIDTH, config.REEL_HEIGHT)
-            )
-
-        img_clip = img_clip.with_duration(duration)
-        scene_clips.append(img_clip)
-        scene_durations.append(duration)
+    # Building a scene decodes its image and resizes it to the reel size in
+    # PIL, which releases the GIL for both; that part overlaps across scenes.
+    # The clip wiring and TextClip layout around it are Python-level and run
+    # serialised. map() keeps scene order.
+    built = list(POOL.map(
+        lambda args: _build_scene_clip(*args, image_paths, reel_size, fps),
+        enumerate(scenes),
+    ))
+    scene_clips = [clip for clip, _ in built]
+    scene_durations = [duration for _, duration in built]
 
     # ─── Concatenate scenes with crossfade (video only) ───────────────────
     if len(scene_clips) > 1:
@@ -128,38 +121,47 @@ def assemble_reel(
         else:
             t += dur
 
-    audio_clips = []
+    # All layers are decoded once and summed into a single stereo buffer at
+    # their start offsets, instead of letting CompositeAudioClip re-mix every
+    # layer per audio chunk during export.
+    mix = np.zeros((int(np.ceil(total_video_duration * AUDIO_MIX_FPS)), 2))
+    audio_layers = 0
 
     # Add narration clips — prevent overlap by tracking when each ends
     narration_cursor = 0.0  # Earliest time the next narration can start
     NARRATION_GAP = 0.3     # Minimum silence gap between narrations (seconds)
 
+    # Decoded narration samples by path: a file reused across scenes is
+    # probed and decoded once (arrays are cached, not open readers)
+    decoded: dict[str, np.ndarray] = {}
+
     for i, scene in enumerate(scenes):
         if i < len(narration_paths) and narration_paths[i] and narration_paths[i].exists():
             try:
-                narr = AudioFileClip(str(narration_paths[i]))
+                narr_samples = _decode_audio(narration_paths[i], decoded)
 
                 # Ideal start = scene start time, but never before previous narration ends
                 ideal_start = scene_start_times[i]
                 safe_start = max(ideal_start, narration_cursor)
 
                 # Ensure narration doesn't exceed this scene's visual end time
+                narr_duration = len(narr_samples) / AUDIO_MIX_FPS
                 scene_end = scene_start_times[i] + scene_durations[i]
-                if safe_start + narr.duration > scene_end + 0.2:
+                if safe_start + narr_duration > scene_end + 0.2:
                     # Trim narration to fit within scene bounds (+ tiny grace)
                     available = max(scene_end - safe_start, 0.5)
-                    narr = narr.subclipped(0, min(narr.duration, available))
-                    logger.debug(f"Scene {scene['scene_number']}: trimmed narration to {narr.duration:.1f}s")
+                    narr_duration = min(narr_duration, available)
+                    logger.debug(f"Scene {scene['scene_number']}: trimmed narration to {narr_duration:.1f}s")
 
-                narr = narr.with_start(safe_start)
-                audio_clips.append(narr)
+                _mix_into(mix, narr_samples[:int(narr_duration * AUDIO_MIX_FPS)], safe_start)
+                audio_layers += 1
 
                 # Update cursor so next narration starts after this one + gap
-                narration_cursor = safe_start + narr.duration + NARRATION_GAP
+                narration_cursor = safe_start + narr_duration + NARRATION_GAP
 
                 logger.debug(
                     f"Scene {scene['scene_number']}: narration at t={safe_start:.1f}s "
-                    f"({narr.duration:.1f}s) → ends at {safe_start + narr.duration:.1f}s"
+                    f"({narr_duration:.1f}s) → ends at {safe_start + narr_duration:.1f}s"
                 )
             except Exception as e:
                 logger.warning(f"Scene {scene['scene_number']}: Failed to load narration: {e}")
@@ -168,27 +170,29 @@ def assemble_reel(
     if music_path and music_path.exists():
         logger.info("Mixing background music...")
         try:
-            music_audio = AudioFileClip(str(music_path))
-
-            # Loop music if shorter than video
-            if music_audio.duration < total_video_duration:
-                loops_needed = int(total_video_duration / music_audio.duration) + 1
-                music_parts = [music_audio] * loops_needed
-                music_audio = concatenate_audioclips(music_parts)
-
-            # Trim to video length
-            music_audio = music_audio.subclipped(0, total_video_duration)
-            music_audio = music_audio.with_volume_scaled(config.MUSIC_VOLUME)
-            audio_clips.append(music_audio)
+            music_audio = AudioFileClip(str(music_path), fps=AUDIO_MIX_FPS)
+            try:
+                # Only decode what the reel can use — custom tracks run minutes
+                samples = music_audio.subclipped(
+                    0, min(music_audio.duration, total_video_duration)
+                ).to_soundarray(fps=AUDIO_MIX_FPS)
+            finally:
+                music_audio.close()
+
+            # Loop music if shorter than video (np.resize repeats the samples
+            # cyclically) and pad/trim it to the exact mix length
+            samples = np.resize(samples, mix.shape)
+            mix += samples * config.MUSIC_VOLUME
+            audio_layers += 1
         except Exception as e:
             logger.warning(f"Failed to add background music: {e}")
 
-    # Compose all audio into one track
-    if audio_clips:
-        combined_audio = CompositeAudioClip(audio_clips)
+    # Attach the mixed track
+    if audio_layers:
+        combined_audio = AudioArrayClip(mix, fps=AUDIO_MIX_FPS)
         combined_audio = combined_audio.with_duration(total_video_duration)
         final_video = final_video.with_audio(combined_audio)
-        logger.info(f"Audio track composed: {len(audio_clips)} clips")
+        logger.info(f"Audio track mixed: {audio_layers} layers")
     else:
         logger.warning("No audio clips available")
 
@@ -196,47 +200,158 @@ def assemble_reel(
     logger.info(f"Exporting MP4: {output_path}")
     logger.info(f"Duration: {final_video.duration:.1f}s | Resolution: {config.REEL_WIDTH}x{config.REEL_HEIGHT} | FPS: {config.REEL_FPS}")
 
-    final_video.write_videofile(
-        str(output_path),
-        fps=config.REEL_FPS,
-        codec=config.EXPORT_CODEC,
+    encoder_options = _video_encoder_options()
+    logger.info(f"Video encoder: {encoder_options['codec']} (preset {encoder_options['preset']})")
+
+    write_kwargs = dict(
+        fps=fps,
         audio_codec=config.EXPORT_AUDIO_CODEC,
-        bitrate=config.EXPORT_BITRATE,
-        preset="medium",
         threads=4,
         logger="bar",
     )
+    try:
+        final_video.write_videofile(str(output_path), **write_kwargs, **encoder_options)
+    except Exception as e:
+        software_options = _software_encoder_options()
+        if encoder_options["codec"] == software_options["codec"]:
+            raise
+        # The probe can pass while the full export still fails (driver or
+        # session limits) — retry once on the CPU encoder
+        logger.warning(f"{encoder_options['codec']} export failed ({e}); retrying with {software_options['codec']}")
+        final_video.write_videofile(str(output_path), **write_kwargs, **software_options)
 
     # Cleanup
     final_video.close()
     for clip in scene_clips:
         clip.close()
 
-    file_size_mb = output_path.stat().st_size / (1024 * 1024)
-    logger.info(f"✅ Reel exported: {output_path} ({file_size_mb:.1f} MB)")
+    size_bytes = output_path.stat().st_size
+    logger.info(f"✅ Reel exported: {output_path} ({size_bytes / (1024 * 1024):.1f} MB)")
+
+    return output_path, size_bytes
 
-    return output_path
+
+def _build_scene_clip(
+    i: int,
+    scene: dict,
+    image_paths: list[Path],
+    reel_size: tuple[int, int],
+    fps: int,
+) -> tuple[CompositeVideoClip | ImageClip, float]:
+    """Build one scene's video clip (image + Ken Burns + text overlay). Returns (clip, duration)."""
+    scene_num = scene["scene_number"]
+    duration = scene.get("duration", config.SCENE_DURATION)
+    text_overlay = scene.get("text_overlay", "")
+
+    logger.info(f"Building Scene {scene_num} clip ({duration}s)")
+
+    # 1. Base image clip with Ken Burns effect (slow zoom)
+    if i < len(image_paths) and image_paths[i] and image_paths[i].exists():
+        img_clip = _create_scene_clip(image_paths[i], duration)
+    else:
+        logger.warning(f"Scene {scene_num}: No image found, using black frame")
+        img_clip = ImageClip(
+            _create_black_frame(), duration=duration
+        ).with_fps(fps)
+
+    # 2. Text overlay
+    if text_overlay:
+        txt_clip = _create_text_overlay(text_overlay, duration)
+        img_clip = CompositeVideoClip(
+            [img_clip, txt_clip],
+            size=reel_size
+        )
+
+    return img_clip.with_duration(duration), duration
+
+
+@functools.lru_cache(maxsize=1)
+def _video_encoder_options() -> dict:
+    """
+    write_videofile() encoder kwargs: the GPU codec (NVENC) at
+    EXPORT_BITRATE if ffmpeg can actually open it on this machine, otherwise
+    x264 with a fast preset, stillimage tuning and CRF rate control.
+    Probed once per process by encoding a few blank frames to the null muxer.
+    """
+    hw_codec = config.EXPORT_HW_CODEC
+    if hw_codec:
+        from moviepy.config import FFMPEG_BINARY
+
+        probe = [
+            FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+            # Same options as the real export, so an unsupported preset fails here
+            "-c:v", hw_codec, "-preset", config.EXPORT_HW_PRESET,
+            "-b:v", config.EXPORT_BITRATE, "-f", "null", "-",
+        ]
+        try:
+            result = subprocess.run(probe, capture_output=True, timeout=15)
+            if result.returncode == 0:
+                return {
+                    "codec": hw_codec,
+                    "preset": config.EXPORT_HW_PRESET,
+                    "bitrate": config.EXPORT_BITRATE,
+                }
+            logger.debug(f"{hw_codec} unavailable: {result.stderr.decode(errors='replace').strip()}")
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"{hw_codec} probe failed: {e}")
+
+    return _software_encoder_options()
+
+
+def _software_encoder_options() -> dict:
+    """write_videofile() kwargs for the x264 fallback encoder."""
+    return {
+        "codec": config.EXPORT_CODEC,
+        "preset": config.EXPORT_PRESET,
+        "ffmpeg_params": ["-tune", config.EXPORT_TUNE, "-crf", str(config.EXPORT_CRF)],
+    }
+
+
+def _decode_audio(path: Path, cache: dict[str, np.ndarray]) -> np.ndarray:
+    """Decode an audio file to a stereo float array at AUDIO_MIX_FPS, once per path."""
+    key = str(path)
+    samples = cache.get(key)
+    if samples is None:
+        clip = AudioFileClip(key, fps=AUDIO_MIX_FPS)
+        try:
+            samples = clip.to_soundarray(fps=AUDIO_MIX_FPS)
+        finally:
+            clip.close()
+        cache[key] = samples
+    return samples
+
+
+def _mix_into(mix: np.ndarray, samples: np.ndarray, start: float) -> None:
+    """Add `samples` into `mix` starting at `start` seconds (clipped to the mix length)."""
+    offset = int(round(start * AUDIO_MIX_FPS))
+    length = min(len(samples), len(mix) - offset)
+    if length > 0:
+        mix[offset:offset + length] += samples[:length]
 
 
 def _create_scene_clip(image_path: Path, duration: float) -> ImageClip:
     """
     Create a video clip from an image with subtle Ken Burns zoom effect.
     """
+    # Bound once; the zoom closure below runs for every rendered frame
+    w, h, fps = config.REEL_WIDTH, config.REEL_HEIGHT, config.REEL_FPS
+
     clip = ImageClip(str(image_path), duration=duration)
 
     # Resize to reel dimensions
-    clip = clip.resized((config.REEL_WIDTH, config.REEL_HEIGHT))
+    clip = clip.resized((w, h))
+
+    # Ken Burns: start at 100%, slowly zoom to 108%
+    # The centre crop is a zero-copy view and cv2.resize's fixed-point bilinear
+    # path is ~4x faster than an equivalent cv2.warpAffine on 1080x1920 frames,
+    # so crop + resize stays. Only the per-frame crop box is computed here.
+    zoom_rate = 0.08 / duration
 
-    # Ken Burns: start at 100%, slowly zoom to 110%
-    # We scale up slightly and use resize over time
     def zoom_effect(get_frame, t):
         """Apply slow zoom from 1.0x to 1.08x over the clip duration."""
-        import numpy as np
-        from PIL import Image as PILImage
-
-        frame = get_frame(t)
-        h, w = frame.shape[:2]
-        zoom = 1.0 + 0.08 * (t / duration)
+        frame = get_frame(t)  # Already w×h after the resize above
+        zoom = 1.0 + zoom_rate * t
 
         # Calculate crop for zoom
         new_w = int(w / zoom)
@@ -246,14 +361,16 @@ def _create_scene_clip(image_path: Path, duration: float) -> ImageClip:
 
         cropped = frame[y_start:y_start + new_h, x_start:x_start + new_w]
 
-        # Resize back to original dimensions
+        # Resize back to original dimensions — the zoom never exceeds 1.08x,
+        # so bilinear is visually indistinguishable from LANCZOS here
+        if cv2 is not None:
+            return cv2.resize(cropped, (w, h), interpolation=cv2.INTER_LINEAR)
         img = PILImage.fromarray(cropped)
-        img = img.resize((w, h), PILImage.Resampling.LANCZOS)
-
+        img = img.resize((w, h), PILImage.Resampling.BILINEAR)
         return np.array(img)
 
     clip = clip.transform(zoom_effect)
-    clip = clip.with_fps(config.REEL_FPS)
+    clip = clip.with_fps(fps)
 
     return clip
 
@@ -301,7 +418,6 @@ def _create_text_overlay(text: str, duration: float) -> TextClip:
 
 def _create_black_frame():
     """Create a black frame as numpy array."""
-    import numpy as np
     return np.zeros((config.REEL_HEIGHT, config.REEL_WIDTH, 3), dtype=np.uint8)
 
 
@@ -12,14 +12,16 @@ The synthesized music creates soft, cinematic ambient pads
 perfect for reel backgrounds.
 """
 
+import functools
 import logging
-import math
 import random
-import struct
+import re
 import wave
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
 import config
 
 logger = logging.getLogger("MusicGenerator")
@@ -68,6 +70,23 @@ MOOD_CHORDS = {
     ],
 }
 
+# audio_tone keywords per mood, checked in order (first hit wins)
+MOOD_KEYWORDS = {
+    "calm": ["calm", "peaceful", "soft", "gentle", "ambient", "lo-fi", "lofi", "chill"],
+    "inspirational": ["inspirational", "uplifting", "hope", "motivational", "bright"],
+    "nostalgic": ["nostalgic", "memory", "vintage", "retro", "warm"],
+    "epic": ["epic", "cinematic", "dramatic", "powerful", "intense", "orchestral"],
+    "melancholic": ["sad", "melancholic", "emotional", "piano", "somber", "dark"],
+    "dreamy": ["dreamy", "ethereal", "floating", "spacey", "atmospheric"],
+}
+
+# One compiled alternation per mood, built once at import.
+# Substring match (no \b) keeps "hopeful" → inspirational, "dramatically" → epic.
+_MOOD_PATTERNS = [
+    (mood, re.compile("|".join(map(re.escape, keywords))))
+    for mood, keywords in MOOD_KEYWORDS.items()
+]
+
 
 def generate_background_music(
     script: dict,
@@ -129,22 +148,72 @@ def _detect_mood(audio_tone: str) -> str:
     """Map script's audio_tone description to a mood key."""
     tone = audio_tone.lower()
 
-    mood_keywords = {
-        "calm": ["calm", "peaceful", "soft", "gentle", "ambient", "lo-fi", "lofi", "chill"],
-        "inspirational": ["inspirational", "uplifting", "hope", "motivational", "bright"],
-        "nostalgic": ["nostalgic", "memory", "vintage", "retro", "warm"],
-        "epic": ["epic", "cinematic", "dramatic", "powerful", "intense", "orchestral"],
-        "melancholic": ["sad", "melancholic", "emotional", "piano", "somber", "dark"],
-        "dreamy": ["dreamy", "ethereal", "floating", "spacey", "atmospheric"],
-    }
-
-    for mood, keywords in mood_keywords.items():
-        if any(kw in tone for kw in keywords):
+    for mood, pattern in _MOOD_PATTERNS:
+        if pattern.search(tone):
             return mood
 
     return "calm"  # Default
 
 
+@functools.lru_cache(maxsize=4)
+def _fade_ramp(samples: int) -> np.ndarray:
+    """Linear 0 → 1 gain ramp (i / samples), shared by fade-in and reversed fade-out."""
+    ramp = np.linspace(0.0, 1.0, samples, endpoint=False, dtype=np.float32)
+    ramp.setflags(write=False)
+    return ramp
+
+
+@functools.lru_cache(maxsize=4)
+def _chord_gain(samples_per_chord: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Time axis and LFO × crossfade gain for one chord (float32: the output
+    is 16-bit, so double precision only doubles memory traffic).
+    Identical for every chord of the same length (time restarts at each chord).
+    """
+    i = np.arange(samples_per_chord, dtype=np.float32)
+    t = i / np.float32(SAMPLE_RATE)
+
+    # Add very subtle LFO wobble for organic feel
+    lfo = 1.0 + 0.03 * np.sin(2 * np.pi * 0.2 * t)
+
+    # Crossfade between chords
+    crossfade_samples = int(0.5 * SAMPLE_RATE)  # 0.5s crossfade
+    envelope = np.where(
+        i < crossfade_samples,
+        i / crossfade_samples,
+        np.where(
+            i > samples_per_chord - crossfade_samples,
+            (samples_per_chord - i) / crossfade_samples,
+            1.0,
+        ),
+    )
+    return t, lfo * envelope
+
+
+@functools.lru_cache(maxsize=8)
+def _chord_buffer(chord_freqs: tuple, samples_per_chord: int) -> np.ndarray:
+    """
+    Render one chord pad (mono, soft-clamped).
+    Memoized: chords shared between progressions / runs are synthesized once.
+    The returned array is read-only — callers copy it via concatenate.
+    """
+    t, gain = _chord_gain(samples_per_chord)
+
+    # (n_freqs, 1) against (samples,) → one row per note
+    phase = 2 * np.pi * np.asarray(chord_freqs, dtype=np.float32)[:, np.newaxis] * t
+    sample = (
+        0.15 * np.sin(phase)          # Main tone
+        + 0.05 * np.sin(2 * phase)    # Soft overtone
+        + 0.08 * np.sin(0.5 * phase)  # Sub bass
+    ).sum(axis=0)
+
+    sample *= gain
+    # Soft clamp
+    buffer = np.clip(sample, -0.8, 0.8)
+    buffer.setflags(write=False)
+    return buffer
+
+
 def _synthesize_ambient(output_path: Path, duration: float, mood: str) -> None:
     """
     Synthesize ambient pad music using sine wave harmonics.
@@ -155,73 +224,42 @@ def _synthesize_ambient(output_path: Path, duration: float, mood: str) -> None:
     chord_duration = duration / len(chords)
     samples_per_chord = int(chord_duration * SAMPLE_RATE)
 
-    audio_data = []
     random.seed(42)  # Reproducible
 
-    for chord_idx, chord_freqs in enumerate(chords):
-        # Repeat chords if needed to fill duration
-        actual_chord = chords[chord_idx % len(chords)]
-
-        for i in range(samples_per_chord):
-            t = i / SAMPLE_RATE
-            sample = 0.0
-
-            for freq in actual_chord:
-                # Main tone
-                sample += 0.15 * math.sin(2 * math.pi * freq * t)
-                # Soft overtone
-                sample += 0.05 * math.sin(2 * math.pi * freq * 2 * t)
-                # Sub bass
-                sample += 0.08 * math.sin(2 * math.pi * freq * 0.5 * t)
-
-            # Add very subtle LFO wobble for organic feel
-            lfo = 1.0 + 0.03 * math.sin(2 * math.pi * 0.2 * t)
-            sample *= lfo
-
-            # Crossfade between chords
-            crossfade_samples = int(0.5 * SAMPLE_RATE)  # 0.5s crossfade
-            if i < crossfade_samples:
-                sample *= i / crossfade_samples
-            elif i > samples_per_chord - crossfade_samples:
-                sample *= (samples_per_chord - i) / crossfade_samples
-
-            # Soft clamp
-            sample = max(-0.8, min(0.8, sample))
-
-            # Stereo: slight delay for width
-            left = sample
-            right = sample * 0.95  # Subtle stereo difference
-            audio_data.append((left, right))
-
-    # Fill any remaining samples
-    while len(audio_data) < total_samples:
-        audio_data.append((0.0, 0.0))
+    # Each distinct chord is rendered once and reused (see _chord_buffer)
+    chord_buffers = [_chord_buffer(tuple(freqs), samples_per_chord) for freqs in chords]
+
+    # Fill any remaining samples with silence
+    signal = np.zeros(total_samples, dtype=np.float32)
+    chord_signal = np.concatenate(chord_buffers)[:total_samples]
+    signal[:len(chord_signal)] = chord_signal
 
     # Global fade in / fade out
     fade_in_samples = int(config.MUSIC_FADE_IN * SAMPLE_RATE)
     fade_out_samples = int(config.MUSIC_FADE_OUT * SAMPLE_RATE)
 
-    for i in range(min(fade_in_samples, len(audio_data))):
-        ratio = i / fade_in_samples
-        audio_data[i] = (audio_data[i][0] * ratio, audio_data[i][1] * ratio)
+    n = min(fade_in_samples, total_samples)
+    signal[:n] *= _fade_ramp(fade_in_samples)[:n]
 
-    for i in range(min(fade_out_samples, len(audio_data))):
-        idx = len(audio_data) - 1 - i
-        ratio = i / fade_out_samples
-        audio_data[idx] = (audio_data[idx][0] * ratio, audio_data[idx][1] * ratio)
+    n = min(fade_out_samples, total_samples)
+    if n:
+        signal[-n:] *= _fade_ramp(fade_out_samples)[n - 1::-1]
+
+    # Stereo: right channel slightly quieter for width
+    # (signal is already clamped to ±0.8, so scaling cannot overflow int16)
+    stereo = np.stack([signal, signal * 0.95], axis=1)
+    stereo = (stereo * 32767).astype(np.int16)
 
     # Write WAV file
     with wave.open(str(output_path), "w") as wav_file:
         wav_file.setnchannels(CHANNELS)
         wav_file.setsampwidth(2)  # 16-bit
         wav_file.setframerate(SAMPLE_RATE)
-
-        for left, right in audio_data[:total_samples]:
-            left_int = int(left * 32767)
-            right_int = int(right * 32767)
-            left_int = max(-32768, min(32767, left_int))
-            right_int = max(-32768, min(32767, right_int))
-            wav_file.writeframes(struct.pack("<hh", left_int, right_int))
+        # Declaring the frame count up front lets `wave` emit a final header
+        # once instead of seeking back to patch it on close
+        wav_file.setnframes(len(stereo))
+        # Interleaved little-endian L/R frames, written in one call
+        wav_file.writeframes(stereo.astype("<i2", copy=False).tobytes())
 
 
 # ─── Standalone test ──────────────────────────────────────────────────────────
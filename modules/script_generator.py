@@ -20,15 +20,33 @@ Output JSON schema:
 }
 """
 
+import hashlib
 import json
 import logging
-import requests
 from typing import Optional
 
+import requests
+
 import config
+from modules._http import get_session, warm_connection
+from modules._pool import POOL
 
 logger = logging.getLogger("ScriptGenerator")
 
+try:
+    import orjson  # Optional: faster JSON for LLM responses and the script cache
+    _json_loads = orjson.loads  # raises a json.JSONDecodeError subclass
+
+    def _json_dumps(obj) -> bytes:
+        """Serialize to compact UTF-8 JSON."""
+        return orjson.dumps(obj)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        """Serialize to compact UTF-8 JSON."""
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
 
 SYSTEM_PROMPT = """You are a cinematic reel scriptwriter for short-form vertical video content (Instagram Reels, TikTok, YouTube Shorts).
 
@@ -64,7 +82,8 @@ def generate_script(
     topic: str,
     style: str = "cinematic",
     mood: str = "inspirational",
-    openrouter_key: Optional[str] = None
+    openrouter_key: Optional[str] = None,
+    refresh: bool = False,
 ) -> dict:
     """
     Generate a complete reel script using OpenRouter free LLM.
@@ -74,17 +93,12 @@ def generate_script(
         style: Visual style (cinematic, anime, documentary, dreamy)
         mood: Emotional mood (inspirational, nostalgic, energetic, calm)
         openrouter_key: Optional API key override
+        refresh: Ignore a cached script and call the LLM again (the new
+                 script still replaces the cache entry)
 
     Returns:
         dict: Structured script with scenes, prompts, overlays, narration
     """
-    api_key = openrouter_key or config.OPENROUTER_API_KEY
-    if not api_key:
-        raise ValueError(
-            "OpenRouter API key not set. Add OPENROUTER_API_KEY to your .env file.\n"
-            "Get a free key at: https://openrouter.ai"
-        )
-
     user_prompt = (
         f"Create a cinematic reel script about: {topic}\n"
         f"Visual style: {style}\n"
@@ -92,6 +106,23 @@ def generate_script(
         f"Generate 4 scenes with ultra-detailed visual prompts, text overlays, and narration."
     )
 
+    cache_key = _cache_key(topic, style, mood)
+    if config.ENABLE_SCRIPT_CACHE and not refresh:
+        cached = _load_cached_script(cache_key)
+        if cached is not None:
+            logger.info(
+                f"Using cached script for topic='{topic}' style='{style}' mood='{mood}' "
+                f"(pass --refresh for a new take)"
+            )
+            return cached
+
+    api_key = openrouter_key or config.OPENROUTER_API_KEY
+    if not api_key:
+        raise ValueError(
+            "OpenRouter API key not set. Add OPENROUTER_API_KEY to your .env file.\n"
+            "Get a free key at: https://openrouter.ai"
+        )
+
     logger.info(f"Generating script | topic='{topic}' style='{style}' mood='{mood}'")
     logger.info(f"Using model: {config.LLM_MODEL}")
 
@@ -110,11 +141,19 @@ def generate_script(
         ],
         "temperature": 0.85,
         "max_tokens": 2000,
-        "top_p": 0.9
+        "top_p": 0.9,
+        # JSON mode: models that support it return a bare object, so the
+        # fence-stripping below becomes a no-op (OpenRouter drops the field
+        # for models that don't)
+        "response_format": {"type": "json_object"},
     }
 
+    # The LLM call takes seconds; open the Pollinations connection meanwhile
+    # so the first scene fetch skips DNS/TLS setup
+    POOL.submit(warm_connection, config.POLLINATIONS_IMAGE_URL)
+
     try:
-        response = requests.post(
+        response = get_session().post(
             config.OPENROUTER_BASE_URL,
             headers=headers,
             json=payload,
@@ -126,19 +165,22 @@ def generate_script(
         content = data["choices"][0]["message"]["content"].strip()
         logger.debug(f"Raw LLM response:\n{content}")
 
-        # Parse JSON — handle markdown code blocks if model wraps it
+        # Parse JSON — handle markdown code blocks if a model without JSON
+        # mode still wraps it
         if content.startswith("```"):
             content = content.split("```")[1]
             if content.startswith("json"):
                 content = content[4:]
             content = content.strip()
 
-        script = json.loads(content)
+        script = _json_loads(content)
 
         # Validate structure
-        _validate_script(script)
+        validate_script(script)
 
         logger.info(f"Script generated: '{script.get('title', 'Untitled')}' — {len(script['scenes'])} scenes")
+        if config.ENABLE_SCRIPT_CACHE:
+            _store_cached_script(cache_key, script)
         return script
 
     except requests.exceptions.HTTPError as e:
@@ -153,8 +195,48 @@ def generate_script(
         raise
 
 
-def _validate_script(script: dict) -> None:
-    """Validate the script structure and fill defaults."""
+def _cache_key(topic: str, style: str, mood: str) -> str:
+    """Exact-match cache key; includes the model and system prompt so changing either misses."""
+    raw = f"{topic.strip().lower()}|{style}|{mood}|{config.LLM_MODEL}|{SYSTEM_PROMPT}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _read_script_cache() -> dict:
+    try:
+        cache = _json_loads(config.SCRIPT_CACHE_FILE.read_bytes())
+    except (FileNotFoundError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _load_cached_script(key: str) -> Optional[dict]:
+    """Return the cached script for `key`, or None on a miss."""
+    return _read_script_cache().get(key)
+
+
+def _store_cached_script(key: str, script: dict) -> None:
+    """Add `script` to the on-disk cache (best effort — failures are only logged)."""
+    try:
+        cache = _read_script_cache()
+        cache[key] = script
+        path = config.SCRIPT_CACHE_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(_json_dumps(cache))
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning(f"Could not update script cache: {e}")
+
+
+def validate_script(script: dict) -> None:
+    """
+    Validate the script structure and fill defaults.
+    Used for both LLM output and custom --script JSON, so the pipeline can
+    index the required keys directly afterwards.
+    """
+    if not isinstance(script, dict):
+        raise ValueError("Script must be a JSON object")
+
     required_keys = ["title", "emotional_core", "audio_tone", "scenes"]
     for key in required_keys:
         if key not in script:
@@ -164,9 +246,15 @@ def _validate_script(script: dict) -> None:
         raise ValueError("Script must contain at least one scene")
 
     for i, scene in enumerate(script["scenes"]):
+        if not isinstance(scene, dict):
+            raise ValueError(f"Scene {i+1} must be a JSON object")
         scene.setdefault("scene_number", i + 1)
         scene.setdefault("duration", config.SCENE_DURATION)
 
+        duration = scene["duration"]
+        if isinstance(duration, bool) or not isinstance(duration, (int, float)):
+            raise ValueError(f"Scene {i+1} 'duration' must be a number of seconds")
+
         for field in ["visual_prompt", "text_overlay", "narration"]:
             if field not in scene:
                 raise ValueError(f"Scene {i+1} missing '{field}'")
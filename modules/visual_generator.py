@@ -10,90 +10,232 @@ Features:
 - Each image is 1080x1920 (vertical 9:16 for reels)
 """
 
+import functools
+import hashlib
+import io
 import logging
+import os
+import shutil
+import threading
 import time
 import urllib.parse
 from pathlib import Path
 from typing import Optional
 
-import requests
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance, ImageOps
+from PIL import Image, ImageChops, ImageDraw, ImageFont, ImageFilter, ImageOps, ImageStat
 
 import config
+from modules._http import get_session
+from modules._pool import POOL
 
 logger = logging.getLogger("VisualGenerator")
 
+# Post-processing grade
+CONTRAST_FACTOR = 1.08
+COLOR_FACTOR = 1.06
+VIGNETTE_INTENSITY = 0.20
+SCENE_JPEG_QUALITY = 95
+# ITU-R 601 luma, as used by PIL's RGB → L conversion
+_LUMA_WEIGHTS = (0.299, 0.587, 0.114)
 
-def generate_scene_images(script: dict, output_dir: Optional[Path] = None) -> list[Path]:
+
+def generate_scene_images(
+    script: dict,
+    output_dir: Optional[Path] = None,
+    refresh: bool = False,
+) -> list[Path]:
     """
     Generate one image per scene from the script's visual prompts.
 
     Args:
         script: The structured script dict from ScriptGenerator
         output_dir: Directory to save images (defaults to config.TEMP_DIR)
+        refresh: Force new renders instead of reusing Pollinations' cached
+                 result for an unchanged prompt
 
     Returns:
         List of file paths to generated images
     """
     output_dir = output_dir or config.TEMP_DIR
     output_dir.mkdir(parents=True, exist_ok=True)
-    image_paths = []
+    scenes = script["scenes"]
 
-    for scene in script["scenes"]:
-        scene_num = scene["scene_number"]
-        prompt = scene["visual_prompt"]
-        logger.info(f"Generating visual for Scene {scene_num}...")
+    # Scenes sharing a prompt (callback shots, B-roll) are rendered once
+    first_with_prompt: dict[str, int] = {}
+    for i, scene in enumerate(scenes):
+        first_with_prompt.setdefault(scene["visual_prompt"].strip(), i)
+    unique = sorted(first_with_prompt.values())
 
-        image_path = output_dir / f"scene_{scene_num:02d}.png"
+    # Each unique scene is an independent HTTP fetch (GIL released while
+    # waiting on the network), so they render on Pollinations concurrently
+    rendered = dict(zip(
+        unique,
+        POOL.map(lambda i: _generate_one(scenes[i], output_dir, refresh), unique),
+    ))
 
-        try:
-            image_path = _generate_pollinations_image(prompt, image_path, scene_num)
-            # Apply cinematic post-processing
-            _post_process_image(image_path)
-            logger.info(f"Scene {scene_num} visual saved + enhanced: {image_path}")
-        except Exception as e:
-            logger.warning(f"Scene {scene_num} Pollinations failed ({e}), using gradient placeholder")
-            image_path = _generate_placeholder(
-                image_path, scene_num, scene.get("text_overlay", "")
-            )
-
-        image_paths.append(image_path)
-
-    logger.info(f"Generated {len(image_paths)} scene visuals")
+    image_paths = []
+    for i, scene in enumerate(scenes):
+        if i in rendered:
+            image_paths.append(rendered[i])
+        else:
+            source = rendered[first_with_prompt[scene["visual_prompt"].strip()]]
+            image_paths.append(_reuse_image(source, scene, output_dir))
+
+    logger.info(
+        f"Generated {len(image_paths)} scene visuals "
+        f"({len(scenes) - len(unique)} reused for duplicate prompts)"
+    )
     return image_paths
 
 
-def _generate_pollinations_image(prompt: str, save_path: Path, scene_num: int) -> Path:
-    """
-    Generate an image via Pollinations.ai free API.
-    Uses the Flux-Realism model for photorealistic quality.
+def _generate_one(scene: dict, output_dir: Path, refresh: bool = False) -> Path:
+    """Generate and post-process one scene image, falling back to a placeholder on failure."""
+    scene_num = scene["scene_number"]
+    prompt = scene["visual_prompt"]
+    logger.info(f"Generating visual for Scene {scene_num}...")
 
-    Strategy:
-    - Generate at 768×1344 (native sweet-spot for Flux) then upscale to
-      1080×1920 with LANCZOS — produces sharper results than generating
-      at full resolution directly.
-    - Use flux-realism model for photorealistic output.
-    - Keep prompt clean and descriptive (avoid spammy quality tags).
+    image_path = output_dir / f"scene_{scene_num:02d}.png"
+    cache_path = _image_cache_path(_enhance_prompt(prompt))
+
+    if not refresh and _restore_cached_image(cache_path, image_path.with_suffix(".jpg")):
+        logger.info(f"Scene {scene_num} visual restored from cache: {cache_path.name}")
+        return image_path.with_suffix(".jpg")
+
+    try:
+        img = _generate_pollinations_image(prompt, scene_num, refresh)
+        # Apply cinematic post-processing, then encode to disk once.
+        # Photographic frames are stored as high-quality JPEG: a fraction of
+        # the PNG encode time and size, and far above what H.264 keeps anyway
+        image_path = image_path.with_suffix(".jpg")
+        _post_process_image(img).save(image_path, "JPEG", quality=SCENE_JPEG_QUALITY)
+        logger.debug(f"Post-processing applied: {image_path.name}")
+        logger.info(f"Scene {scene_num} visual saved + enhanced: {image_path}")
+        _store_cached_image(image_path, cache_path)
+    except Exception as e:
+        logger.warning(f"Scene {scene_num} Pollinations failed ({e}), using gradient placeholder")
+        image_path = _generate_placeholder(
+            image_path, scene_num, scene.get("text_overlay", "")
+        )
+
+    return image_path
+
+
+def _reuse_image(source: Path, scene: dict, output_dir: Path) -> Path:
     """
-    # Clean, descriptive prompt — Flux-realism works best with natural language
-    enhanced_prompt = (
+    Give a duplicate-prompt scene its own copy of an already rendered frame.
+    (A copy, not a hardlink: later runs rewrite scene files in place, which
+    would silently change every linked scene.) Placeholders are regenerated
+    instead, since they carry the scene's own number and text.
+    """
+    scene_num = scene["scene_number"]
+    image_path = output_dir / f"scene_{scene_num:02d}{source.suffix}"
+
+    if source.suffix != ".jpg":
+        return _generate_placeholder(image_path, scene_num, scene.get("text_overlay", ""))
+
+    shutil.copyfile(source, image_path)
+    logger.info(f"Scene {scene_num} reuses {source.name} (same visual prompt)")
+    return image_path
+
+
+def _enhance_prompt(prompt: str) -> str:
+    """Clean, descriptive prompt — Flux-realism works best with natural language."""
+    return (
         f"{prompt}, "
         f"photorealistic, cinematic lighting, shallow depth of field, "
         f"sharp focus, high detail, professional DSLR photo, "
         f"9:16 vertical composition"
     )
 
-    # Generate at a lower native res (Flux sweet-spot) then upscale
-    gen_width = 768
-    gen_height = 1344
+
+def _image_cache_path(enhanced_prompt: str) -> Path:
+    """Cache entry for a finished frame; keyed on everything that shapes the output."""
+    raw = (
+        f"{enhanced_prompt}|{config.REEL_WIDTH}x{config.REEL_HEIGHT}|{config.NATIVE_RESOLUTION}|"
+        f"{CONTRAST_FACTOR}|{COLOR_FACTOR}|{VIGNETTE_INTENSITY}"
+    )
+    key = hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+    return config.IMAGE_CACHE_DIR / f"{key}.jpg"
+
+
+def _restore_cached_image(cache_path: Path, save_path: Path) -> bool:
+    """Copy a cached frame to `save_path`. Returns False on a miss."""
+    try:
+        shutil.copyfile(cache_path, save_path)
+        os.utime(cache_path)  # Mark as recently used for eviction
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        # Includes the entry being evicted by another scene mid-restore
+        logger.warning(f"Could not read image cache entry {cache_path.name}: {e}")
+        return False
+    return True
+
+
+def _store_cached_image(image_path: Path, cache_path: Path) -> None:
+    """Add a finished frame to the cache, then evict least-recently-used entries over the limit."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Copy under a temporary name and rename into place, so a crash or a
+        # concurrent run never leaves a truncated JPEG at the cache path
+        tmp = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            shutil.copyfile(image_path, tmp)
+            os.replace(tmp, cache_path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        entries = []
+        with os.scandir(cache_path.parent) as it:
+            for entry in it:
+                if entry.name.endswith(".jpg") and entry.is_file():  # Skip in-flight .tmp copies
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= config.IMAGE_CACHE_MAX_BYTES:
+                break
+            Path(path).unlink(missing_ok=True)
+            total -= size
+    except OSError as e:
+        logger.warning(f"Could not update image cache: {e}")
+
+
+def _generate_pollinations_image(prompt: str, scene_num: int, refresh: bool = False) -> Image.Image:
+    """
+    Generate an image via Pollinations.ai free API, decoded in memory.
+    Uses the Flux-Realism model for photorealistic quality.
+
+    Strategy:
+    - config.NATIVE_RESOLUTION (default): request POLLINATIONS_WIDTH ×
+      POLLINATIONS_HEIGHT (the reel size) so no local upscale is needed.
+    - Otherwise generate at 768×1344 (Flux sweet-spot) then upscale to
+      1080×1920 with LANCZOS + unsharp mask.
+    - Use flux-realism model for photorealistic output.
+    - Keep prompt clean and descriptive (avoid spammy quality tags).
+    - Seed is derived from the prompt, so an unchanged prompt maps to the
+      same URL and Pollinations can serve its cached render; `refresh`
+      salts the seed to force a new one.
+    """
+    enhanced_prompt = _enhance_prompt(prompt)
+
+    if config.NATIVE_RESOLUTION:
+        gen_width, gen_height = config.POLLINATIONS_WIDTH, config.POLLINATIONS_HEIGHT
+    else:
+        # Generate at a lower native res (Flux sweet-spot) then upscale
+        gen_width, gen_height = 768, 1344
 
     encoded_prompt = urllib.parse.quote(enhanced_prompt)
-    unique_seed = int(time.time() * 1000) + scene_num * 137
+    seed = int.from_bytes(
+        hashlib.blake2b(enhanced_prompt.encode("utf-8"), digest_size=4).digest(), "little"
+    )
+    if refresh:
+        seed ^= (int(time.time() * 1000) + scene_num * 137) & 0xFFFFFFFF
     url = (
         f"https://image.pollinations.ai/prompt/{encoded_prompt}"
         f"?width={gen_width}"
         f"&height={gen_height}"
-        f"&seed={unique_seed}"
+        f"&seed={seed}"
         f"&nologo=true"
         f"&enhance=true"
         f"&model=flux-realism"
@@ -101,7 +243,7 @@ def _generate_pollinations_image(prompt: str, save_path: Path, scene_num: int) -
 
     logger.debug(f"Pollinations URL length: {len(url)} chars")
 
-    response = requests.get(url, timeout=config.IMAGE_GENERATION_TIMEOUT, stream=True)
+    response = get_session().get(url, timeout=config.IMAGE_GENERATION_TIMEOUT, stream=True)
     response.raise_for_status()
 
     # Verify we got an image
@@ -109,56 +251,79 @@ def _generate_pollinations_image(prompt: str, save_path: Path, scene_num: int) -
     if "image" not in content_type and len(response.content) < 10000:
         raise ValueError(f"Response doesn't look like an image: {content_type}")
 
-    save_path.write_bytes(response.content)
-
-    # Upscale to full reel resolution with high-quality resampling + sharpening
-    with Image.open(save_path) as img:
-        # LANCZOS upscale from 768×1344 → 1080×1920
-        img = img.resize(
-            (config.REEL_WIDTH, config.REEL_HEIGHT),
-            Image.Resampling.LANCZOS,
-        )
-        # Unsharp mask recovers fine detail lost during upscale
-        img = img.filter(ImageFilter.UnsharpMask(radius=1.5, percent=80, threshold=2))
-        # Save as high-quality PNG
-        img.save(save_path, "PNG", optimize=True)
-
-    return save_path
-
-
-def _post_process_image(image_path: Path) -> None:
+    # Decode straight from the response body — nothing touches disk until
+    # the final post-processed frame is saved
+    img = Image.open(io.BytesIO(response.content))
+    img.load()
+
+    # Fit to full reel resolution. Native-size renders usually skip this
+    # (or only snap to the grid Flux rounds dimensions to)
+    reel_size = (config.REEL_WIDTH, config.REEL_HEIGHT)
+    if img.size != reel_size:
+        scale = max(reel_size[0] / img.width, reel_size[1] / img.height)
+        if 0.9 < scale < 1.1:
+            # Within ~10% of the target, bilinear is visually identical to
+            # the 8-tap LANCZOS kernel and several times cheaper; there is
+            # no upscale blur to recover
+            img = img.resize(reel_size, Image.Resampling.BILINEAR)
+        else:
+            # LANCZOS upscale (e.g. 768×1344 → 1080×1920) ...
+            img = img.resize(reel_size, Image.Resampling.LANCZOS)
+            # ... then unsharp mask recovers fine detail lost during upscale
+            img = img.filter(ImageFilter.UnsharpMask(radius=1.5, percent=80, threshold=2))
+
+    return img
+
+
+def _post_process_image(img: Image.Image) -> Image.Image:
     """
     Apply cinematic post-processing to enhance image quality.
 
     Pipeline:
-    1. Sharpening — recover detail lost in compression
-    2. Contrast boost — cinematic punch
-    3. Color saturation — vivid but not overdone
-    4. Slight vignette — draws focus to center
+    1. Contrast boost — cinematic punch
+    2. Color saturation — vivid but not overdone
+    3. Slight vignette — draws focus to center
+
+    Contrast and saturation are both linear in RGB, so they are folded into
+    one colour-matrix convert; the vignette is a single multiply against a
+    cached mask. Each pixel is touched twice instead of once per effect.
     """
-    with Image.open(image_path) as img:
-        # 1. Mild contrast boost — cinematic pop without crushing blacks
-        contrast = ImageEnhance.Contrast(img)
-        img = contrast.enhance(1.08)
+    img = img.convert("RGB")
 
-        # 2. Subtle color richness
-        color = ImageEnhance.Color(img)
-        img = color.enhance(1.06)
+    # 1 + 2. Mild contrast boost (cinematic pop without crushing blacks) and
+    #        subtle color richness, as one matrix pass
+    mean = ImageStat.Stat(img.convert("L")).mean[0]
+    img = img.convert("RGB", _grade_matrix(mean))
 
-        # 3. Light vignette — draws eye to center
-        img = _apply_vignette(img, intensity=0.20)
+    # 3. Light vignette — draws eye to center
+    return ImageChops.multiply(img, _vignette_mask(*img.size, VIGNETTE_INTENSITY))
 
-        img.save(image_path, "PNG", optimize=True)
 
-    logger.debug(f"Post-processing applied: {image_path.name}")
+def _grade_matrix(mean: float) -> tuple[float, ...]:
+    """
+    12-tuple RGB → RGB matrix equivalent to ImageEnhance.Contrast(CONTRAST_FACTOR)
+    followed by ImageEnhance.Color(COLOR_FACTOR).
 
+    Contrast:   c = a·x + (1 - a)·mean            (blend away from mean grey)
+    Saturation: o = s·c - (s - 1)·luma(c)         (blend away from pixel luma)
+    Luma weights sum to 1, so the contrast offset passes through unchanged.
+    """
+    a, s = CONTRAST_FACTOR, COLOR_FACTOR
+    offset = (1.0 - a) * mean
+    matrix = []
+    for i in range(3):
+        matrix += [a * (s * (i == j) - (s - 1.0) * wj) for j, wj in enumerate(_LUMA_WEIGHTS)]
+        matrix.append(offset)
+    return tuple(matrix)
 
-def _apply_vignette(img: Image.Image, intensity: float = 0.3) -> Image.Image:
-    """Apply a subtle vignette (darkened edges) for cinematic feel."""
-    import numpy as np
 
-    w, h = img.size
-    arr = np.array(img, dtype=np.float32)
+@functools.lru_cache(maxsize=8)
+def _vignette_mask(w: int, h: int, intensity: float) -> Image.Image:
+    """
+    Radial RGB gain mask (255 = untouched) for ImageChops.multiply.
+    Size and intensity are fixed for a run, so every scene shares one mask.
+    """
+    import numpy as np
 
     # Create radial gradient mask
     Y, X = np.ogrid[:h, :w]
@@ -167,10 +332,17 @@ def _apply_vignette(img: Image.Image, intensity: float = 0.3) -> Image.Image:
     dist = np.sqrt((X - cx) ** 2 / (cx ** 2) + (Y - cy) ** 2 / (cy ** 2))
     # Vignette: darken beyond 60% radius
     vignette = np.clip(1.0 - intensity * np.maximum(dist - 0.6, 0) / 0.8, 0, 1)
-    vignette = vignette[:, :, np.newaxis]  # broadcast to RGB
+    gain = np.round(vignette * 255).astype(np.uint8)
+    return Image.fromarray(gain).convert("RGB")
 
-    result = (arr * vignette).astype(np.uint8)
-    return Image.fromarray(result)
+
+@functools.lru_cache(maxsize=1)
+def _placeholder_fonts() -> tuple[ImageFont.ImageFont, ImageFont.ImageFont]:
+    """(large, small) placeholder fonts, loaded from disk once per process."""
+    try:
+        return ImageFont.truetype("arial.ttf", 72), ImageFont.truetype("arial.ttf", 36)
+    except OSError:
+        return ImageFont.load_default(), ImageFont.load_default()
 
 
 def _generate_placeholder(save_path: Path, scene_num: int, text: str) -> Path:
@@ -190,27 +362,15 @@ def _generate_placeholder(save_path: Path, scene_num: int, text: str) -> Path:
     ]
     color_pair = gradients[scene_num % len(gradients)]
 
-    img = Image.new("RGB", (w, h))
+    # Vertical gradient: colourise a 1-px-wide grey ramp, then stretch it
+    # across the width (nearest-neighbour copies each row's colour)
+    ramp = Image.linear_gradient("L").resize((1, h))
+    img = ImageOps.colorize(ramp, black=color_pair[0], white=color_pair[1])
+    img = img.resize((w, h), Image.Resampling.NEAREST)
     draw = ImageDraw.Draw(img)
 
-    # Draw vertical gradient
-    for y in range(h):
-        ratio = y / h
-        r = int(color_pair[0][0] + (color_pair[1][0] - color_pair[0][0]) * ratio)
-        g = int(color_pair[0][1] + (color_pair[1][1] - color_pair[0][1]) * ratio)
-        b = int(color_pair[0][2] + (color_pair[1][2] - color_pair[0][2]) * ratio)
-        draw.line([(0, y), (w, y)], fill=(r, g, b))
-
-    # Add subtle noise / grain for cinematic feel
-    img = img.filter(ImageFilter.GaussianBlur(radius=2))
-
     # Add scene number and text
-    try:
-        font_large = ImageFont.truetype("arial.ttf", 72)
-        font_small = ImageFont.truetype("arial.ttf", 36)
-    except OSError:
-        font_large = ImageFont.load_default()
-        font_small = ImageFont.load_default()
+    font_large, font_small = _placeholder_fonts()
 
     # Scene number
     scene_text = f"SCENE {scene_num}"
@@ -234,7 +394,8 @@ def _generate_placeholder(save_path: Path, scene_num: int, text: str) -> Path:
             font=font_small
         )
 
-    img.save(save_path, "PNG")
+    # Flat gradient + text compresses well even at the fastest zlib level
+    img.save(save_path, "PNG", compress_level=1)
     return save_path
 
 
@@ -8,7 +8,9 @@ Supports 300+ voices across 50+ languages.
 """
 
 import asyncio
+import contextlib
 import logging
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -18,6 +20,28 @@ import config
 
 logger = logging.getLogger("VoiceGenerator")
 
+# One long-lived event loop on a daemon thread serves every TTS call, instead
+# of asyncio.run() building and tearing down a loop per call. Started on
+# first use so importing this module stays cheap.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="VoiceGeneratorLoop", daemon=True
+            ).start()
+        return _loop
+
+
+def _run(coro):
+    """Run `coro` on the shared loop and block until it finishes (like asyncio.run)."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
 
 async def _generate_voice_async(
     text: str,
@@ -37,6 +61,23 @@ async def _generate_voice_async(
     return output_path
 
 
+async def _generate_all_async(jobs: list[tuple[str, Path]]) -> list:
+    """Run every (text, output_path) job concurrently; failures are returned, not raised."""
+    return await asyncio.gather(
+        *(
+            _generate_voice_async(
+                text=text,
+                output_path=path,
+                voice=config.TTS_VOICE,
+                rate=config.TTS_RATE,
+                pitch=config.TTS_PITCH
+            )
+            for text, path in jobs
+        ),
+        return_exceptions=True,
+    )
+
+
 def generate_narration(
     script: dict,
     output_dir: Optional[Path] = None
@@ -53,34 +94,31 @@ def generate_narration(
     """
     output_dir = output_dir or config.TEMP_DIR
     output_dir.mkdir(parents=True, exist_ok=True)
-    audio_paths = []
+    audio_paths: list[Optional[Path]] = [None] * len(script["scenes"])
+    jobs: list[tuple[int, int, str, Path]] = []  # (index, scene_num, text, path)
 
-    for scene in script["scenes"]:
+    for i, scene in enumerate(script["scenes"]):
         scene_num = scene["scene_number"]
         narration_text = scene.get("narration", "").strip()
 
         if not narration_text:
             logger.warning(f"Scene {scene_num} has no narration text, skipping voice")
-            audio_paths.append(None)
             continue
 
         audio_path = output_dir / f"narration_{scene_num:02d}.mp3"
         logger.info(f"Generating voice for Scene {scene_num}: '{narration_text[:60]}...'")
+        jobs.append((i, scene_num, narration_text, audio_path))
 
-        try:
-            asyncio.run(_generate_voice_async(
-                text=narration_text,
-                output_path=audio_path,
-                voice=config.TTS_VOICE,
-                rate=config.TTS_RATE,
-                pitch=config.TTS_PITCH
-            ))
-            logger.info(f"Scene {scene_num} narration saved: {audio_path}")
-            audio_paths.append(audio_path)
+    # All scenes are synthesized concurrently on the shared loop — each TTS
+    # request is a network round-trip, so they overlap instead of queueing
+    results = _run(_generate_all_async([(text, path) for _, _, text, path in jobs]))
 
-        except Exception as e:
-            logger.error(f"Scene {scene_num} voice generation failed: {e}")
-            audio_paths.append(None)
+    for (i, scene_num, _, audio_path), result in zip(jobs, results):
+        if isinstance(result, BaseException):  # gather() can also return CancelledError
+            logger.error(f"Scene {scene_num} voice generation failed: {result}")
+        else:
+            logger.info(f"Scene {scene_num} narration saved: {audio_path}")
+            audio_paths[i] = audio_path
 
     generated = sum(1 for p in audio_paths if p is not None)
     logger.info(f"Generated {generated}/{len(audio_paths)} narration audio files")
@@ -119,7 +157,7 @@ def generate_full_narration(
     output_path = output_dir / "narration_full.mp3"
     logger.info(f"Generating full narration ({len(full_text)} chars)")
 
-    asyncio.run(_generate_voice_async(
+    _run(_generate_voice_async(
         text=full_text,
         output_path=output_path,
         voice=config.TTS_VOICE,
@@ -131,9 +169,35 @@ def generate_full_narration(
     return output_path
 
 
+def prewarm() -> None:
+    """
+    Start a throwaway TTS request in the background (non-blocking), so DNS
+    resolution and edge-tts' first-request setup are paid while other work
+    runs (e.g. the LLM script call) rather than by the first scene.
+    Best effort: failures are only logged.
+    """
+    asyncio.run_coroutine_threadsafe(_prewarm_async(), _get_loop())
+
+
+async def _prewarm_async() -> None:
+    try:
+        stream = edge_tts.Communicate("warm up", voice=config.TTS_VOICE).stream()
+        async with contextlib.aclosing(stream):
+            async for _ in stream:
+                break  # First chunk is enough — the connection path is warm
+    except Exception as e:
+        logger.debug(f"TTS prewarm failed: {e}")
+
+
+_all_voices: Optional[list[dict]] = None  # edge_tts.list_voices(), fetched once
+
+
 async def list_available_voices(language_filter: str = "en") -> list[dict]:
     """List all available TTS voices, optionally filtered by language."""
-    voices = await edge_tts.list_voices()
+    global _all_voices
+    if _all_voices is None:
+        _all_voices = await edge_tts.list_voices()
+    voices = _all_voices
     if language_filter:
         voices = [v for v in voices if v["Locale"].startswith(language_filter)]
     return voices
@@ -141,7 +205,7 @@ async def list_available_voices(language_filter: str = "en") -> list[dict]:
 
 def print_voices(language: str = "en"):
     """Print available voices for a language."""
-    voices = asyncio.run(list_available_voices(language))
+    voices = _run(list_available_voices(language))
     print(f"\n{'Voice Name':<35} {'Gender':<10} {'Locale'}")
     print("─" * 60)
     for v in voices: